@@ -0,0 +1,35 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class _UserLookup:
+    """
+    Stands in for the user model inside JWTAuthentication.get_user, so its
+    lookup goes through a select_related queryset and everything else
+    (active and revoked-token checks) stays simplejwt's own.
+    """
+
+    def __init__(self, model, *related):
+        self.objects = model.objects.select_related(*related)
+        self.DoesNotExist = model.DoesNotExist
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user's Profile and Student in the
+    same query.
+
+    Permissions and viewsets read request.user.profile on almost every
+    request, and student endpoints read request.user.student, so joining
+    them here saves a separate lookup for each.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_model = _UserLookup(self.user_model, 'profile', 'student')
+
+
+class ProfileJWTScheme(SimpleJWTScheme):
+    # drf-spectacular only matches the exact simplejwt class, so document
+    # this one as the same Bearer scheme
+    target_class = ProfileJWTAuthentication
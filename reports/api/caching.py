@@ -0,0 +1,110 @@
+import hashlib
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.response import Response
+
+from reports.models import Course, CourseReview, Student
+
+
+# Per-process caches can't see each other's invalidations, so with several
+# workers one would keep serving a response another has just invalidated.
+_PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _enabled():
+    """Whether responses are cached: only with a backend shared by all workers"""
+    return settings.CACHES['default']['BACKEND'] not in _PROCESS_LOCAL_BACKENDS
+
+
+def _version(scope):
+    """Current cache version for a scope such as 'reviews' or 'course:3'"""
+    return cache.get_or_set(f'api-version:{scope}', lambda: uuid.uuid4().hex, None)
+
+
+def invalidate(*scopes):
+    """Drop every cached response for the given scopes"""
+    if not _enabled():
+        return
+    # Responses are keyed on the scope's version, so a new version orphans
+    # the old entries and they expire on their own.
+    cache.delete_many([f'api-version:{scope}' for scope in scopes])
+
+
+def cache_per_user(scope):
+    """
+    Cache a viewset action's response data per user, path and query string.
+
+    scope names the data the response depends on and is formatted with the
+    view kwargs, e.g. 'course:{pk}'; the signal handlers below invalidate
+    the same scopes when that data is written.
+    Keying on the user keeps role-filtered responses (e.g. a lecturer's
+    reviews) from leaking to other users. Without a shared cache backend
+    (REDIS_URL unset) the action runs uncached.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not _enabled():
+                return view_method(self, request, *args, **kwargs)
+
+            name = scope.format(**kwargs)
+            raw_key = f'{name}:{_version(name)}:{request.user.pk}:{request.get_full_path()}'
+            key = 'api-response:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
+
+
+# Invalidate cached responses when the data behind them changes. Anything not
+# covered here (e.g. a username change) is picked up once API_CACHE_TIMEOUT passes.
+
+@receiver([post_save, post_delete], sender=CourseReview)
+def invalidate_review_cache(sender, instance, **kwargs):
+    invalidate('reviews', f'course:{instance.course_id}')
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_course_cache(sender, instance, **kwargs):
+    invalidate(f'course:{instance.pk}', 'reviews')
+
+
+# pre_delete so the student's enrollments are still there to look up
+@receiver([post_save, pre_delete], sender=Student)
+def invalidate_student_cache(sender, instance, **kwargs):
+    if not _enabled():
+        return
+    # Course details list both enrolled students and reviewers
+    course_ids = set(instance.courses.values_list('id', flat=True))
+    course_ids.update(instance.coursereview_set.values_list('course_id', flat=True))
+    invalidate('reviews', *[f'course:{pk}' for pk in course_ids])
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def invalidate_enrollment_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if not _enabled() or action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        course_ids = [instance.pk]
+    elif pk_set is not None:
+        # Called through student.courses, so pk_set holds course ids
+        course_ids = pk_set
+    else:
+        # student.courses.clear() doesn't say which courses it empties
+        course_ids = instance.courses.values_list('id', flat=True)
+    invalidate(*[f'course:{pk}' for pk in course_ids])
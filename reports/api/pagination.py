@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Cursor pagination for large tables such as grades and reviews.
+
+    Pages are fetched by seeking on the primary key, so unlike
+    PageNumberPagination there is no SELECT COUNT(*) per request.
+    Views with an OrderingFilter also need ordering = ['-id'], since
+    the filter decides the ordering when present.
+    """
+    ordering = '-id'
+    page_size = 20
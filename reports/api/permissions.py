@@ -1,40 +1,48 @@
 from rest_framework import permissions
 
+from reports.models import Profile, Student
+
+
+def _role(request):
+    """Return the role of the requesting user, or None if there isn't one"""
+    user = request.user
+    if not (user and user.is_authenticated):
+        return None
+    try:
+        # The profile is cached on the user after the first access
+        return user.profile.role
+    except Profile.DoesNotExist:
+        return None
+
+
+def _student_id(request):
+    """Return the id of the requesting user's Student, or None"""
+    try:
+        # Joined in by ProfileJWTAuthentication, so usually no query
+        return request.user.student.pk
+    except (AttributeError, Student.DoesNotExist):
+        return None
+
 
 class IsStudent(permissions.BasePermission):
     """Permission class for student role"""
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            hasattr(request.user, 'profile') and 
-            request.user.profile.role == 'student'
-        )
+        return _role(request) == 'student'
 
 
 class IsLecturer(permissions.BasePermission):
     """Permission class for lecturer role"""
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            hasattr(request.user, 'profile') and 
-            request.user.profile.role == 'lecturer'
-        )
+        return _role(request) == 'lecturer'
 
 
 class IsAdmin(permissions.BasePermission):
     """Permission class for admin role"""
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            hasattr(request.user, 'profile') and 
-            request.user.profile.role == 'admin'
-        )
+        return _role(request) == 'admin'
 
 
 class IsStudentOrReadOnly(permissions.BasePermission):
@@ -51,19 +59,14 @@ class IsStudentOrReadOnly(permissions.BasePermission):
             return True
         
         # Write permissions only for the student themselves
-        return hasattr(obj, 'user') and obj.user == request.user
+        return hasattr(obj, 'user_id') and obj.user_id == request.user.pk
 
 
 class IsLecturerOrAdmin(permissions.BasePermission):
     """Permission class for lecturer or admin roles"""
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            hasattr(request.user, 'profile') and 
-            request.user.profile.role in ['lecturer', 'admin']
-        )
+        return _role(request) in ['lecturer', 'admin']
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -76,9 +79,10 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        # Write permissions are only allowed to the owner
-        if hasattr(obj, 'student'):
-            return obj.student.user == request.user
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
+        # Write permissions are only allowed to the owner. Compare ids so
+        # neither the object's student nor its user has to be loaded.
+        if hasattr(obj, 'student_id'):
+            return obj.student_id is not None and obj.student_id == _student_id(request)
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.pk
         return False
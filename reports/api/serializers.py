@@ -34,23 +34,13 @@ class StudentSerializer(serializers.ModelSerializer):
 
 class CourseSerializer(serializers.ModelSerializer):
     """Serializer for Course model"""
-    student_count = serializers.SerializerMethodField()
+    # Annotated by the viewset querysets (set on create by CourseViewSet.perform_create)
+    student_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Course
         fields = ['id', 'name', 'code', 'credit_units', 'lecturer', 'student_count']
         read_only_fields = ['id']
-    
-    def get_student_count(self, obj):
-        return obj.students.count()
-
-
-class CourseDetailSerializer(CourseSerializer):
-    """Detailed serializer for Course with students"""
-    students = StudentSerializer(many=True, read_only=True)
-    
-    class Meta(CourseSerializer.Meta):
-        fields = CourseSerializer.Meta.fields + ['students']
 
 
 class GradeSerializer(serializers.ModelSerializer):
@@ -87,10 +77,20 @@ class CourseReviewSerializer(serializers.ModelSerializer):
         return value
 
 
+class CourseDetailSerializer(CourseSerializer):
+    """Detailed serializer for Course with students and reviews"""
+    students = StudentSerializer(many=True, read_only=True)
+    reviews = CourseReviewSerializer(many=True, read_only=True)
+    
+    class Meta(CourseSerializer.Meta):
+        fields = CourseSerializer.Meta.fields + ['students', 'reviews']
+
+
 class StudentDetailSerializer(StudentSerializer):
     """Detailed serializer for Student with courses and grades"""
     enrolled_courses = CourseSerializer(source='courses', many=True, read_only=True)
-    grades = GradeSerializer(many=True, read_only=True, source='grade_set')
+    # Prefetched by StudentViewSet.get_queryset, loaded in to_representation otherwise
+    grades = GradeSerializer(many=True, read_only=True, source='prefetched_grades')
     gpa = serializers.SerializerMethodField()
     cgpa = serializers.SerializerMethodField()
     semester_remark = serializers.SerializerMethodField()
@@ -98,20 +98,30 @@ class StudentDetailSerializer(StudentSerializer):
     class Meta(StudentSerializer.Meta):
         fields = StudentSerializer.Meta.fields + ['enrolled_courses', 'grades', 'cgpa', 'semester_remark']
     
+    def to_representation(self, instance):
+        if not hasattr(instance, 'prefetched_grades'):
+            instance.prefetched_grades = list(instance.grade_set.select_related('course'))
+        return super().to_representation(instance)
+    
     def get_gpa(self, obj):
-        """Calculate GPA"""
+        """GPA annotated by reports.selectors.students_with_gpa, if present"""
+        if hasattr(obj, 'calculated_gpa'):
+            return round(obj.calculated_gpa, 2)
         from reports.utils import calculate_gpa
         return calculate_gpa(obj)
     
     def get_cgpa(self, obj):
-        """Calculate CGPA"""
+        """CGPA annotated by reports.selectors.students_with_gpa, if present"""
+        if hasattr(obj, 'calculated_cgpa'):
+            return round(obj.calculated_cgpa, 2)
         from reports.utils import calculate_cgpa
         return calculate_cgpa(obj)
     
     def get_semester_remark(self, obj):
         """Get semester remark based on grades"""
-        grades = Grade.objects.filter(student=obj)
-        if not grades.exists():
+        # Reuse the grades already loaded for the grades field
+        grades = obj.prefetched_grades
+        if not grades:
             return "No grades yet"
         if all(grade.np_status == "NP" for grade in grades):
             return "Normal Progress"
@@ -1,9 +1,12 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django_auto_prefetching import prefetch
 
 from reports.models import Student, Course, Grade, CourseReview, Profile
 from .serializers import (
@@ -12,7 +15,70 @@ from .serializers import (
     ProfileSerializer, EnrollmentSerializer
 )
 from .permissions import IsStudent, IsLecturer, IsAdmin, IsLecturerOrAdmin, IsOwnerOrReadOnly
+from .caching import cache_per_user
+from .pagination import IdCursorPagination
 from reports.utils import calculate_gpa, calculate_cgpa
+from reports.selectors import students_with_gpa
+
+
+def _enrolled_courses():
+    """Courses annotated with student_count, safe to prefetch through Student.courses"""
+    # A plain Count('students') would reuse the prefetch join and count only
+    # the student being fetched, so count the through table separately.
+    enrollments = (
+        Course.students.through.objects
+        .filter(course=OuterRef('pk'))
+        .values('course')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Course.objects.annotate(student_count=Coalesce(Subquery(enrollments), 0))
+
+
+def _student_rows(queryset):
+    """Students in StudentSerializer's shape, built from one values() query"""
+    rows = queryset.values(
+        'id', 'name', 'email', 'gpa',
+        'user__id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    )
+    return [
+        {
+            'id': row['id'],
+            'user': {
+                'id': row['user__id'],
+                'username': row['user__username'],
+                'email': row['user__email'],
+                'first_name': row['user__first_name'],
+                'last_name': row['user__last_name'],
+            } if row['user__id'] is not None else None,
+            'name': row['name'],
+            'email': row['email'],
+            'gpa': row['gpa'],
+        }
+        for row in rows
+    ]
+
+
+def _review_rows(queryset):
+    """Reviews in CourseReviewSerializer's shape, built from one values() query"""
+    created_at = serializers.DateTimeField()  # same formatting as the serializer
+    rows = queryset.values(
+        'id', 'course', 'course__name', 'student', 'student__name',
+        'rating', 'comment', 'created_at',
+    )
+    return [
+        {
+            'id': row['id'],
+            'course': row['course'],
+            'course_name': row['course__name'],
+            'student': row['student'],
+            'student_name': row['student__name'],
+            'rating': row['rating'],
+            'comment': row['comment'],
+            'created_at': created_at.to_representation(row['created_at']),
+        }
+        for row in rows
+    ]
 
 
 class StudentViewSet(viewsets.ModelViewSet):
@@ -39,6 +105,29 @@ class StudentViewSet(viewsets.ModelViewSet):
             return StudentDetailSerializer
         return StudentSerializer
     
+    def get_queryset(self):
+        """Load related rows up front so serializing doesn't query per student"""
+        queryset = Student.objects.select_related('user')
+        if self.get_serializer_class() is StudentDetailSerializer:
+            # Detail view also walks enrolled courses and each grade's course
+            queryset = students_with_gpa(queryset).prefetch_related(
+                Prefetch('courses', queryset=_enrolled_courses()),
+                Prefetch(
+                    'grade_set',
+                    queryset=Grade.objects.select_related('course').only(
+                        'id', 'score', 'letter', 'student_id', 'course_id', 'course__name', 'course__code',
+                    ),
+                    to_attr='prefetched_grades',
+                ),
+            )
+        elif self.action == 'list':
+            # Only the columns StudentSerializer renders
+            queryset = queryset.only(
+                'id', 'name', 'email', 'gpa',
+                'user__id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+            )
+        return queryset
+    
     def get_permissions(self):
         if self.action in ['list', 'create', 'update', 'partial_update', 'destroy']:
             return [IsLecturerOrAdmin()]
@@ -48,7 +137,7 @@ class StudentViewSet(viewsets.ModelViewSet):
     def me(self, request):
         """Get current logged-in student details"""
         try:
-            student = Student.objects.get(user=request.user)
+            student = self.get_queryset().get(user=request.user)
             serializer = self.get_serializer(student)
             return Response(serializer.data)
         except Student.DoesNotExist:
@@ -64,7 +153,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         
         # Only allow students to enroll themselves
         if hasattr(request.user, 'profile') and request.user.profile.role != 'student':
-            if student.user != request.user:
+            if student.user_id != request.user.pk:
                 return Response(
                     {"detail": "You can only enroll yourself"},
                     status=status.HTTP_403_FORBIDDEN
@@ -72,9 +161,9 @@ class StudentViewSet(viewsets.ModelViewSet):
         
         serializer = EnrollmentSerializer(data=request.data)
         if serializer.is_valid():
-            course = Course.objects.get(id=serializer.validated_data['course_id'])
+            course = Course.objects.only('id', 'name').get(id=serializer.validated_data['course_id'])
             
-            if student in course.students.all():
+            if course.students.filter(pk=student.pk).exists():
                 return Response(
                     {"detail": "Already enrolled in this course"},
                     status=status.HTTP_400_BAD_REQUEST
@@ -94,7 +183,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         
         # Only allow students to unenroll themselves
         if hasattr(request.user, 'profile') and request.user.profile.role != 'student':
-            if student.user != request.user:
+            if student.user_id != request.user.pk:
                 return Response(
                     {"detail": "You can only unenroll yourself"},
                     status=status.HTTP_403_FORBIDDEN
@@ -102,9 +191,9 @@ class StudentViewSet(viewsets.ModelViewSet):
         
         serializer = EnrollmentSerializer(data=request.data)
         if serializer.is_valid():
-            course = Course.objects.get(id=serializer.validated_data['course_id'])
+            course = Course.objects.only('id', 'name').get(id=serializer.validated_data['course_id'])
             
-            if student not in course.students.all():
+            if not course.students.filter(pk=student.pk).exists():
                 return Response(
                     {"detail": "Not enrolled in this course"},
                     status=status.HTTP_400_BAD_REQUEST
@@ -121,7 +210,7 @@ class StudentViewSet(viewsets.ModelViewSet):
     def grades(self, request, pk=None):
         """Get all grades for a student"""
         student = self.get_object()
-        grades = Grade.objects.filter(student=student)
+        grades = Grade.objects.filter(student=student).select_related('student', 'course')
         serializer = GradeSerializer(grades, many=True)
         return Response(serializer.data)
     
@@ -159,31 +248,59 @@ class CourseViewSet(viewsets.ModelViewSet):
             return CourseDetailSerializer
         return CourseSerializer
     
+    def get_queryset(self):
+        """Count enrolled students in the same query as the courses"""
+        queryset = Course.objects.annotate(student_count=Count('students'))
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch('students', queryset=Student.objects.select_related('user')),
+                Prefetch(
+                    'reviews',
+                    queryset=CourseReview.objects.select_related('student').only(
+                        'id', 'course_id', 'student_id', 'rating', 'comment', 'created_at', 'student__name',
+                    ),
+                ),
+            )
+        elif self.action == 'list':
+            # Only the columns CourseSerializer renders
+            queryset = queryset.only('id', 'name', 'code', 'credit_units', 'lecturer')
+        return queryset
+    
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsLecturerOrAdmin()]
         return [IsAuthenticated()]
     
+    def perform_create(self, serializer):
+        course = serializer.save()
+        # Not annotated like the queryset courses; a new course has no students
+        course.student_count = 0
+    
+    @cache_per_user('course:{pk}')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=True, methods=['get'])
     def students(self, request, pk=None):
         """Get all students enrolled in a course"""
         course = self.get_object()
         
         # Get students from both M2M and grades
-        students_from_m2m = list(course.students.all())
-        students_from_grades = [grade.student for grade in Grade.objects.filter(course=course)]
-        students = list({student.id: student for student in students_from_m2m + students_from_grades}.values())
+        students = (
+            Student.objects
+            .filter(Q(courses=course) | Q(grade__course=course))
+            .distinct()
+        )
         
-        serializer = StudentSerializer(students, many=True)
-        return Response(serializer.data)
+        # Read-only listing, so skip model instances and the serializer
+        return Response(_student_rows(students))
     
     @action(detail=True, methods=['get'])
     def reviews(self, request, pk=None):
         """Get all reviews for a course"""
         course = self.get_object()
         reviews = CourseReview.objects.filter(course=course)
-        serializer = CourseReviewSerializer(reviews, many=True)
-        return Response(serializer.data)
+        return Response(_review_rows(reviews))
 
 
 class GradeViewSet(viewsets.ModelViewSet):
@@ -200,6 +317,8 @@ class GradeViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['student', 'course', 'letter']
     ordering_fields = ['score', 'letter']
+    ordering = ['-id']
+    pagination_class = IdCursorPagination
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -208,22 +327,23 @@ class GradeViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter grades based on user role"""
-        queryset = Grade.objects.all()
+        queryset = Grade.objects.select_related('student', 'course')
         user = self.request.user
         
         if hasattr(user, 'profile'):
             if user.profile.role == 'student':
                 # Students can only see their own grades
-                try:
-                    student = Student.objects.get(user=user)
-                    queryset = queryset.filter(student=student)
-                except Student.DoesNotExist:
-                    queryset = queryset.none()
+                queryset = queryset.filter(student__user=user)
             elif user.profile.role == 'lecturer':
                 # Lecturers can see grades for their courses
-                lecturer_courses = Course.objects.filter(lecturer=user.profile.name)
-                queryset = queryset.filter(course__in=lecturer_courses)
+                queryset = queryset.filter(course__lecturer=user.profile.name)
         
+        if self.action == 'list':
+            # Only the columns GradeSerializer renders
+            queryset = queryset.only(
+                'id', 'student_id', 'course_id', 'score', 'letter',
+                'student__name', 'course__name', 'course__code',
+            )
         return queryset
 
 
@@ -242,16 +362,21 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['course', 'student', 'rating']
     ordering_fields = ['rating', 'created_at']
+    ordering = ['-id']
+    pagination_class = IdCursorPagination
     
     def get_permissions(self):
         if self.action == 'create':
             return [IsStudent()]
         return [IsAuthenticated(), IsOwnerOrReadOnly()]
     
+    @cache_per_user('reviews')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         """Auto-assign current student when creating review"""
-        student = Student.objects.get(user=self.request.user)
-        serializer.save(student=student)
+        serializer.save(student=self.request.user.student)
     
     def get_queryset(self):
         """Filter reviews based on user role"""
@@ -267,7 +392,8 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
                 lecturer_courses = Course.objects.filter(lecturer=user.profile.name)
                 queryset = queryset.filter(course__in=lecturer_courses)
         
-        return queryset
+        # Join whatever relations the serializer renders
+        return prefetch(queryset, self.get_serializer_class())
 
 
 class ProfileViewSet(viewsets.ReadOnlyModelViewSet):
@@ -284,6 +410,10 @@ class ProfileViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['role']
     
+    def get_queryset(self):
+        # Join/prefetch whatever relations the serializer renders
+        return prefetch(Profile.objects.all(), self.get_serializer_class())
+    
     def get_permissions(self):
         if self.action == 'list':
             return [IsAdmin()]
@@ -12,3 +12,6 @@ class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
 
+    def ready(self):
+        # Connect the API response cache invalidation signals
+        from reports.api import caching
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-14 03:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_profile_courses'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['lecturer'], name='reports_cou_lecture_2779d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', 'rating'], name='reports_cou_course__d83c69_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['letter'], name='reports_gra_letter_4f673d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['student', 'course'], name='reports_gra_student_07d518_idx'),
+        ),
+    ]
@@ -23,17 +23,29 @@ class Course(models.Model):
     lecturer = models.CharField(max_length=200)
     students = models.ManyToManyField(Student, related_name='courses', blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['lecturer']),  # lecturer course lookups and search
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.code})"
     
     
 class Grade(models.Model):
+    NP_LETTERS = ['A', 'B', 'C', 'D']  # letters counted as Normal Progress
+
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     score = models.IntegerField()
     letter = models.CharField(max_length=2, blank=True)  # new field
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['letter']),
+            models.Index(fields=['student', 'course']),
+        ]
+
     def save(self, *args, **kwargs):
         if self.score is not None:
             self.score = int(self.score)
@@ -74,7 +86,7 @@ class Grade(models.Model):
     @property
     def np_status(self):
         # Normal Progress if grade is A-D
-        if self.letter in ['A', 'B', 'C', 'D']:
+        if self.letter in self.NP_LETTERS:
             return "NP"
         return "BNP"  # Not in Normal Progress
 
@@ -87,6 +99,11 @@ class CourseReview (models.Model):
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['course', 'rating']),
+        ]
+
     def __str__(self):
         return f"{self.course.name} - {self.rating} by {self.student.name}"
 
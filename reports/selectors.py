@@ -0,0 +1,27 @@
+from django.db.models import Case, F, FloatField, IntegerField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from .utils import LETTER_POINTS
+
+
+def students_with_gpa(queryset):
+    """
+    Annotate students with calculated_gpa and calculated_cgpa.
+
+    Computes the same weighted average as calculate_gpa/calculate_cgpa,
+    but in the student query itself instead of once per student. Values
+    are left unrounded; round in Python to match the utils functions.
+    """
+    grade_point = Case(
+        *[When(grade__letter=letter, then=Value(points)) for letter, points in LETTER_POINTS.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    total_points = Sum(grade_point * F('grade__course__credit_units'))
+    total_credits = Sum('grade__course__credit_units')
+    gpa = Cast(total_points, FloatField()) / NullIf(total_credits, 0)
+    return queryset.annotate(
+        calculated_gpa=Coalesce(gpa, Value(0.0)),
+        # CGPA covers the same set of grades as calculate_cgpa does
+        calculated_cgpa=F('calculated_gpa'),
+    )
@@ -8,31 +8,28 @@ LETTER_POINTS = {
     'F': 0,
 }
 
-def calculate_gpa(student):
-    grades = Grade.objects.filter(student=student)
-    if not grades.exists():
-        return 0  # GPA
-
+def _grade_totals(student):
+    """Sum grade points and credit units over a student's grades in one query"""
+    rows = Grade.objects.filter(student=student).values_list('letter', 'course__credit_units')
     total_points = 0
     total_credits = 0
 
-    for grade in grades:
-        points = LETTER_POINTS.get(grade.letter, 0)
-        total_points += points * grade.course.credit_units
-        total_credits += grade.course.credit_units
+    for letter, credit_units in rows:
+        total_points += LETTER_POINTS.get(letter, 0) * credit_units
+        total_credits += credit_units
 
-    gpa = total_points / total_credits if total_credits else 0
+    return total_points, total_credits
+
+def calculate_gpa(student):
+    total_points, total_credits = _grade_totals(student)
+    if total_credits == 0:
+        return 0  # GPA
+
+    gpa = total_points / total_credits
     return round(gpa, 2)
 
 def calculate_cgpa(student):
-    grades = student.grade_set.all()  # all grades for the student
-    total_points = 0
-    total_credits = 0
-
-    for grade in grades:
-        points = LETTER_POINTS.get(grade.letter, 0)
-        total_points += points * grade.course.credit_units
-        total_credits += grade.course.credit_units
+    total_points, total_credits = _grade_totals(student)  # all grades for the student
 
     if total_credits == 0:
         return 0
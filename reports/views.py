@@ -981,6 +981,7 @@ from .models import Student, Grade, Course, CourseReview, Profile
 from django.contrib.auth import authenticate, login, logout
 from .forms import CourseForm
 from .utils import calculate_gpa, calculate_cgpa
+from .selectors import students_with_gpa
 from django.contrib import messages
 import csv
 from django.http import HttpResponse
@@ -1208,15 +1209,10 @@ def admin_dashboard(request):
 
     recent_courses = courses[:8]
 
-    top_students = []
-    for student in students:
-        gset = Grade.objects.filter(student=student)
-        total_points = sum((g.grade_point or 0) * g.course.credit_units for g in gset)
-        total_units = sum(g.course.credit_units for g in gset)
-        gpa = round(total_points / total_units, 2) if total_units > 0 else 0
-         
-        top_students.append({'student': student, 'gpa': gpa})
-    top_students = sorted(top_students, key=lambda x: x['gpa'], reverse=True)[:5]
+    top_students = [
+        {'student': student, 'gpa': round(student.calculated_gpa, 2)}
+        for student in students_with_gpa(students).order_by('-calculated_gpa', 'id')[:5]
+    ]
 
     context = {
         'courses': courses,
@@ -1241,24 +1237,20 @@ def admin_courses(request):
 @login_required
 @user_passes_test(admin_required)
 def admin_students(request):
-    students = Student.objects.all()
-    students_with_gpa = []
+    rows = []
 
-    for student in students:
-        student_grades = Grade.objects.filter(student=student)
-        total_points = sum((g.grade_point or 0) * g.course.credit_units for g in student_grades)
-        total_units = sum(g.course.credit_units for g in student_grades)
-        gpa = round(total_points / total_units, 2) if total_units > 0 else 0
-        cgpa = gpa
+    for student in students_with_gpa(Student.objects.all()):
+        gpa = round(student.calculated_gpa, 2)
+        cgpa = round(student.calculated_cgpa, 2)
 
-        students_with_gpa.append({
+        rows.append({
             'student': student,
             'gpa': gpa,
             'cgpa': cgpa,
         })
 
     return render(request, 'reports/admin_students.html', {
-        'students_with_gpa': students_with_gpa
+        'students_with_gpa': rows
     })
 
 
@@ -5,6 +5,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+import dj_database_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -74,16 +76,38 @@ WSGI_APPLICATION = 'studetPortals.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Uses PostgreSQL when DATABASE_URL is set (docker-compose, Render), SQLite otherwise.
+# Connections are kept open for CONN_MAX_AGE seconds instead of being
+# reopened on every request, and checked before reuse.
+# DATABASE_SSL_REQUIRE=True requires TLS, as production on Render does.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=int(os.environ.get('CONN_MAX_AGE', 600)),
+        conn_health_checks=True,
+        ssl_require=os.environ.get('DATABASE_SSL_REQUIRE', 'False') == 'True',
+    )
 }
 
-# For production, use PostgreSQL:
-# import dj_database_url
-# DATABASES['default'] = dj_database_url.config(conn_max_age=600, ssl_require=True)
+# When DATABASE_URL points at pgbouncer in transaction pooling mode, server-side
+# cursors can't survive between transactions, so turn them off:
+# DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+
+# Cache
+# Shared Redis cache when REDIS_URL is set (see docker-compose.yml), so every
+# worker sees the same invalidations. Without it Django's per-process memory
+# cache is used and API responses are not cached.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+
+# Seconds a cached API response may be served (see reports/api/caching.py)
+API_CACHE_TIMEOUT = int(os.environ.get('API_CACHE_TIMEOUT', 60))
 
 
 # Password validation
@@ -128,7 +152,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'reports.api.authentication.ProfileJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',  # For browsable API
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -142,9 +166,12 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # The browsable API is only offered while DEBUG is on
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
+    ) if DEBUG else (
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
     ),
 }
 